@@ -1,6 +1,8 @@
 import pandas as pd
 import numpy as np
 
+from csv_io import write_csv_arrow
+
 # ============================================================================
 # STEP 1: 读取原始数据
 # ============================================================================
@@ -33,7 +35,8 @@ print(f"2022年腕表数据: {len(df_2022_watches)} 行")
 # 2026数据的local_reference格式: "WT100015"
 # 需要去掉"CR"前缀才能匹配
 
-df_2022_watches['ref_clean'] = df_2022_watches['reference_code'].str.replace('CR', '').str.strip()
+# 只去掉开头的"CR"，避免误删编号中间的"CR"
+df_2022_watches['ref_clean'] = df_2022_watches['reference_code'].str.strip().str.removeprefix('CR')
 df_2026['ref_clean'] = df_2026['local_reference'].str.strip()
 
 # ============================================================================
@@ -75,32 +78,24 @@ exchange_rates = {
     'JPY': 0.0065   # 1 JPY ≈ 0.0065 EUR
 }
 
-df_2022_watches['price_eur'] = df_2022_watches.apply(
-    lambda row: row['price'] * exchange_rates.get(row['currency'], 1.0), 
-    axis=1
-)
+# 向量化换算：按币种映射汇率（未知币种按1.0处理），再整列相乘
+rates = df_2022_watches['currency'].str.upper().map(exchange_rates).fillna(1.0)
+df_2022_watches['price_eur'] = df_2022_watches['price'].astype('float64').to_numpy() * rates.to_numpy()
 
 # ============================================================================
-# STEP 6: 匹配2022和2026的产品
+# STEP 6-7: 匹配并合并2022和2026的产品
 # ============================================================================
 
-# 只保留两个年份都有的产品
-matched_2022 = df_2022_watches[df_2022_watches['ref_clean'].isin(df_2026['ref_clean'])].copy()
-matched_2026 = df_2026[df_2026['ref_clean'].isin(matched_2022['ref_clean'])].copy()
-
-print(f"可匹配产品数: {len(matched_2022)} 款")
-
-# ============================================================================
-# STEP 7: 合并数据
-# ============================================================================
-
-# 通过ref_clean合并，后缀标识来源
-merged = matched_2022.merge(
-    matched_2026[['ref_clean', 'price_eur', 'collection_std', 'title']], 
+# 只保留两个年份都有的产品：inner merge 一次完成匹配与合并，后缀标识来源
+merged = df_2022_watches.merge(
+    df_2026[['ref_clean', 'price_eur', 'collection_std', 'title']], 
     on='ref_clean', 
+    how='inner',
     suffixes=('_2022', '_2026')
 )
 
+print(f"可匹配产品数: {len(merged)} 款")
+
 # ============================================================================
 # STEP 8: 计算价格变化
 # ============================================================================
@@ -114,17 +109,13 @@ merged['price_change_pct'] = (
 # STEP 9: 添加价格区间分类
 # ============================================================================
 
-def price_segment(price):
-    if price < 5000:
-        return 'Entry Level'
-    elif price < 15000:
-        return 'Accessible Luxury'
-    elif price < 30000:
-        return 'High Luxury'
-    else:
-        return 'Haute Horlogerie'
-
-merged['price_segment'] = merged['price_eur_2026'].apply(price_segment)
+# 区间左闭右开: <5000 / <15000 / <30000 / 其余
+merged['price_segment'] = pd.cut(
+    merged['price_eur_2026'],
+    bins=[-np.inf, 5000, 15000, 30000, np.inf],
+    labels=['Entry Level', 'Accessible Luxury', 'High Luxury', 'Haute Horlogerie'],
+    right=False
+)
 
 # ============================================================================
 # 生成CSV 1: cartier_tableau_data.csv (主数据文件 - 宽格式)
@@ -163,7 +154,7 @@ tableau_data.columns = [
 tableau_data = tableau_data.sort_values('Price_Change_Pct', ascending=False)
 
 # 保存
-tableau_data.to_csv('cartier_tableau_data.csv', index=False)
+write_csv_arrow(tableau_data, 'cartier_tableau_data.csv', bom=False)
 print(f"\n✓ cartier_tableau_data.csv 已生成 ({len(tableau_data)} 行)")
 
 # ============================================================================
@@ -171,36 +162,29 @@ print(f"\n✓ cartier_tableau_data.csv 已生成 ({len(tableau_data)} 行)")
 # ============================================================================
 
 # 将宽格式转换为长格式，便于Tableau创建时间序列图
-long_format = []
-
-for _, row in tableau_data.iterrows():
-    # 2022年数据点
-    long_format.append({
-        'Reference': row['Reference'],
-        'Collection': row['Collection'],
-        'Material': row['Material'],
-        'Size': row['Size'],
-        'Price_Segment': row['Price_Segment'],
-        'Original_Currency': row['Original_Currency'],
-        'Product_Name': row['Product_Name'],
-        'Year': 2022,
-        'Price_EUR': row['Price_2022_EUR']
-    })
-    # 2026年数据点
-    long_format.append({
-        'Reference': row['Reference'],
-        'Collection': row['Collection'],
-        'Material': row['Material'],
-        'Size': row['Size'],
-        'Price_Segment': row['Price_Segment'],
-        'Original_Currency': row['Original_Currency'],
-        'Product_Name': row['Product_Name'],
-        'Year': 2026,
-        'Price_EUR': row['Price_2026_EUR']
-    })
-
-long_df = pd.DataFrame(long_format)
-long_df.to_csv('cartier_tableau_timeseries.csv', index=False)
+long_df = (
+    tableau_data.reset_index(drop=True)
+    .melt(
+        id_vars=[
+            'Reference',
+            'Collection',
+            'Material',
+            'Size',
+            'Price_Segment',
+            'Original_Currency',
+            'Product_Name'
+        ],
+        value_vars=['Price_2022_EUR', 'Price_2026_EUR'],
+        var_name='Year',
+        value_name='Price_EUR',
+        ignore_index=False
+    )
+    # 保持每个产品的2022/2026两行相邻（与宽表排序一致）
+    .sort_index(kind='stable')
+    .reset_index(drop=True)
+)
+long_df['Year'] = long_df['Year'].map({'Price_2022_EUR': 2022, 'Price_2026_EUR': 2026}).astype('int16')
+write_csv_arrow(long_df, 'cartier_tableau_timeseries.csv', bom=False)
 print(f"✓ cartier_tableau_timeseries.csv 已生成 ({len(long_df)} 行)")
 
 # ============================================================================
@@ -224,7 +208,7 @@ summary_stats = pd.DataFrame({
     ]
 })
 
-summary_stats.to_csv('cartier_summary_stats.csv', index=False)
+write_csv_arrow(summary_stats, 'cartier_summary_stats.csv', bom=False)
 print(f"✓ cartier_summary_stats.csv 已生成 ({len(summary_stats)} 行)")
 
 # ============================================================================
@@ -250,7 +234,7 @@ collection_stats.columns = [
 # 重置索引（Collection从行索引变为普通列）
 collection_stats = collection_stats.reset_index()
 
-collection_stats.to_csv('cartier_collection_stats.csv', index=False)
+write_csv_arrow(collection_stats, 'cartier_collection_stats.csv', bom=False)
 print(f"✓ cartier_collection_stats.csv 已生成 ({len(collection_stats)} 行)")
 
 # ============================================================================
@@ -3,22 +3,46 @@ from datetime import datetime
 from pathlib import Path
 
 import pandas as pd
+from pandas.api.types import is_numeric_dtype
+import pyarrow.parquet as pq
+
+from csv_io import read_csv_arrow, read_csv_header, write_csv_arrow
+
+RUN_TS = datetime.now().strftime("%Y%m%d_%H%M%S")
+
 
 def ts() -> str:
-    return datetime.now().strftime("%Y%m%d_%H%M%S")
+    return RUN_TS
+
+
+def read_labeled(path: Path, usecols: list[str], name: str) -> pd.DataFrame:
+    """
+    Prefer the typed Parquet sidecar written by feature_engineering.py when it is
+    at least as new as the CSV and has every column; otherwise parse the CSV.
+    Missing columns are reported against the CSV's full header, before projecting.
+    """
+    pq_path = path.with_suffix(".parquet")
+    if (
+        pq_path.exists()
+        and pq_path.stat().st_mtime >= path.stat().st_mtime
+        and set(usecols) <= set(pq.read_schema(pq_path).names)
+    ):
+        return pd.read_parquet(pq_path, columns=usecols)
+    ensure_cols(read_csv_header(path), usecols, name)
+    return read_csv_arrow(path, usecols=usecols)
 
 
 def pick_latest(dir_: Path, pattern: str) -> Path:
-    files = sorted(dir_.glob(pattern))
-    if not files:
+    latest = max(dir_.glob(pattern), default=None)
+    if latest is None:
         raise FileNotFoundError(f"No files matching {pattern} under {dir_.resolve()}")
-    return files[-1]
+    return latest
 
 
-def ensure_cols(df: pd.DataFrame, cols: list[str], name: str):
-    missing = [c for c in cols if c not in df.columns]
+def ensure_cols(header: list[str], cols: list[str], name: str):
+    missing = [c for c in cols if c not in header]
     if missing:
-        raise ValueError(f"{name} missing columns: {missing} | got={df.columns.tolist()}")
+        raise ValueError(f"{name} missing columns: {missing} | got={header}")
 
 
 def summarize_by_collection(df: pd.DataFrame, year: int) -> pd.DataFrame:
@@ -26,25 +50,23 @@ def summarize_by_collection(df: pd.DataFrame, year: int) -> pd.DataFrame:
     Expects at least:
       collection_canonical, price_eur
     """
-    df = df.copy()
-    df["year"] = year
-
-    df["price_eur"] = pd.to_numeric(df["price_eur"], errors="coerce")
-    df_valid = df[df["price_eur"].notna()].copy()
-
-    if len(df_valid) == 0:
+    # work on local Series: no frame copy, and the caller's df is left untouched
+    # float64 so Arrow NaN (from coerced text) and NA both count as missing
+    price_eur = df["price_eur"]
+    if not is_numeric_dtype(price_eur):
+        price_eur = pd.to_numeric(price_eur, errors="coerce")
+    price_eur = price_eur.astype("float64")
+    collection = df["collection_canonical"].astype("category")
+
+    if not price_eur.notna().any():
         raise ValueError(f"No valid price_eur rows for year={year}")
 
-    total = df.groupby("collection_canonical").size().rename("n_total").reset_index()
-    eur_n = df_valid.groupby("collection_canonical").size().rename("n_price_eur").reset_index()
-
-    stats = (
-        df_valid.groupby("collection_canonical")["price_eur"]
-        .agg(avg_price_eur="mean", median_price_eur="median")
+    # size counts every row, count only non-NaN prices: both stay on the Cython path
+    out = (
+        price_eur.groupby(collection, observed=True)
+        .agg(n_total="size", n_price_eur="count", avg_price_eur="mean", median_price_eur="median")
         .reset_index()
     )
-
-    out = total.merge(eur_n, on="collection_canonical", how="left").merge(stats, on="collection_canonical", how="left")
     out["year"] = year
 
     out["share_in_year"] = out["n_total"] / out["n_total"].sum()
@@ -68,11 +90,8 @@ def main():
     f2022 = processed / args.in_2022 if args.in_2022 else pick_latest(processed, "baseline_2022_labeled*.csv")
     f2026 = processed / args.in_2026 if args.in_2026 else pick_latest(processed, "current_2026_labeled*.csv")
 
-    df22 = pd.read_csv(f2022)
-    df26 = pd.read_csv(f2026)
-
-    ensure_cols(df22, ["collection_canonical", "price_eur"], "2022 labeled")
-    ensure_cols(df26, ["collection_canonical", "price_eur"], "2026 labeled")
+    df22 = read_labeled(f2022, ["collection_canonical", "price_eur"], "2022 labeled")
+    df26 = read_labeled(f2026, ["collection_canonical", "price_eur"], "2026 labeled")
 
     s22 = summarize_by_collection(df22, 2022)
     s26 = summarize_by_collection(df26, 2026)
@@ -81,10 +100,10 @@ def main():
     out_path = Path(args.out) if args.out else (processed / "collection_summary.csv")
 
     try:
-        summary.to_csv(out_path, index=False, encoding="utf-8-sig")
+        write_csv_arrow(summary, out_path)
     except PermissionError:
         out_path = processed / f"collection_summary_{ts()}.csv"
-        summary.to_csv(out_path, index=False, encoding="utf-8-sig")
+        write_csv_arrow(summary, out_path)
 
     print(f"[OK] Saved: {out_path}")
     print(summary.head(20).to_string(index=False))
@@ -0,0 +1,46 @@
+"""
+Shared Arrow-backed CSV I/O for the scripts under src/.
+"""
+
+import codecs
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+
+def read_csv_header(path: Path) -> list[str]:
+    """Column names from the header row only, for checks made before a usecols projection."""
+    return pd.read_csv(path, nrows=0).columns.tolist()
+
+
+def read_csv_arrow(
+    path: Path, usecols: list[str] | None = None, string_cols: list[str] | None = None
+) -> pd.DataFrame:
+    """
+    Read with the multi-threaded Arrow parser into Arrow-backed columns.
+    usecols entries absent from the header are skipped so callers can report them.
+    string_cols are typed as text by the parser itself, so "00123" / "5350.0" stay verbatim.
+    """
+    if usecols is not None or string_cols is not None:
+        header = read_csv_header(path)
+        if usecols is not None:
+            usecols = [c for c in usecols if c in header]
+        string_cols = [c for c in (string_cols or []) if c in header]
+    convert_options = pacsv.ConvertOptions(
+        column_types={c: pa.string() for c in string_cols or []},
+        include_columns=usecols,
+    )
+    return pacsv.read_csv(path, convert_options=convert_options).to_pandas(types_mapper=pd.ArrowDtype)
+
+
+def write_csv_arrow(df: pd.DataFrame, path: Path | str, bom: bool = True) -> None:
+    """
+    Arrow's C++ CSV writer, prefixed with a UTF-8 BOM (Excel / Power BI) unless bom=False.
+    """
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    with open(path, "wb") as f:
+        if bom:
+            f.write(codecs.BOM_UTF8)
+        pacsv.write_csv(table, f)
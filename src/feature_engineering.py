@@ -3,107 +3,163 @@ import argparse
 from datetime import datetime
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
+from pandas.api.types import is_numeric_dtype, is_string_dtype
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from csv_io import read_csv_arrow, read_csv_header, write_csv_arrow
+
+# Copy-on-Write (always on from pandas 3): selections below can be modified
+# without defensive .copy() calls and without aliasing the source frame.
+if int(pd.__version__.split(".")[0]) < 3:
+    pd.set_option("mode.copy_on_write", True)
+
+# one timestamp per run so the FE and labeled outputs pair up
+RUN_TS = datetime.now().strftime("%Y%m%d_%H%M%S")
+
 
 def ts() -> str:
-    return datetime.now().strftime("%Y%m%d_%H%M%S")
+    return RUN_TS
 
 
-def parse_price_to_float(x) -> float:
+def write_parquet_sidecar(df: pd.DataFrame, csv_path: Path) -> Path:
     """
-    Robust parsing for prices like:
-      "5,000€" / "5 000 €" / "5000" / 5000.0 / None
-    Returns float or NaN.
+    Typed, zstd-compressed copy next to a CSV output, so downstream steps can skip
+    re-parsing text. The CSV stays the Power BI / Tableau handoff.
     """
-    if pd.isna(x):
-        return float("nan")
-    if isinstance(x, (int, float)):
-        return float(x)
-
-    s = str(x).strip()
-    if not s:
-        return float("nan")
-
-    s = s.replace("\u00a0", " ").replace("€", "").strip()
-    s = s.replace(" ", "")
-    s = s.replace(",", "").replace(".", "")
-
-    m = re.search(r"(\d+)", s)
-    return float(m.group(1)) if m else float("nan")
-
-
-def normalize_cartier_url(u: str, country_path="/fr-fr") -> str:
-    if pd.isna(u):
-        return ""
-    s = str(u).strip()
-    if not s:
-        return ""
-    if s.startswith("http://") or s.startswith("https://"):
-        return s
-    if not s.startswith(country_path):
-        if s.startswith("/"):
-            s = country_path + s
-        else:
-            s = country_path + "/" + s
-    return "https://www.cartier.com" + s
-
-
-def infer_market_from_url(url_full: str) -> str:
+    out = csv_path.with_suffix(".parquet")
+    df.to_parquet(out, engine="pyarrow", compression="zstd", index=False)
+    return out
+
+
+def normalize_code(s: pd.Series) -> pd.Series:
     """
-    Example: https://www.cartier.com/fr-fr/... -> fr-fr
+    Blank-fill, trim and upper-case an identifier column. Arrow-backed input is
+    handled by chaining pyarrow.compute kernels on the Arrow buffer directly,
+    without a pandas Series per step; anything else uses the .str chain.
     """
-    if not url_full:
-        return ""
-    m = re.search(r"cartier\.com/([a-z]{2}-[a-z]{2})/", url_full)
-    return m.group(1) if m else ""
+    if isinstance(s.dtype, pd.ArrowDtype) and pa.types.is_string(s.dtype.pyarrow_dtype):
+        arr = pa.array(s)
+        out = pc.utf8_upper(pc.utf8_trim_whitespace(pc.fill_null(arr, "")))
+        return pd.Series(pd.arrays.ArrowExtensionArray(out), index=s.index, name=s.name)
+    return s.fillna("").str.strip().str.upper()
 
 
-def canonicalize_collection_from_text(text: str) -> str:
+# Vectorized patterns, defined once and shared by every str.* call below.
+# The NBSP is a literal character: Arrow's RE2 engine rejects \u escapes, and
+# extract groups are named because ArrowDtype.str.extract requires it.
+PRICE_STRIP_PATTERN = "[\\s€\u00a0.,]"
+PRICE_DIGITS_PATTERN = r"(?P<digits>\d+)"
+MARKET_PATTERN = r"cartier\.com/(?P<market>[a-z]{2}-[a-z]{2})/"
+
+
+def parse_price_to_float(price: pd.Series) -> pd.Series:
     """
-    Role A requirement: use string match (str.contains) in title/url to infer collection.
-    Extend keywords as needed.
+    Vectorized parsing for prices like:
+      "5,000€" / "5 000 €" / "5000" / 5000.0 / None
+    Numeric values go straight through to_numeric; only the text residue is
+    stripped of currency/spaces/separators and reduced to its first digit run.
+    Returns float64 with NaN where unparseable.
     """
-    t = (text or "").lower()
-    rules = [
-        ("Tank", [" tank " , "tank"]),
-        ("Santos", ["santos"]),
-        ("Panthère", ["panth", "panthere", "panthère"]),
-        ("Ballon Bleu", ["ballon bleu", "ballon-bleu", "ballonbleu"]),
-        ("Trinity", ["trinity"]),
-    ]
-    for name, kws in rules:
-        if any(k in t for k in kws):
-            return name
-    return "Other"
+    # dispatch on dtype: numeric columns need no parsing, string columns
+    # (Arrow-backed from read_csv_arrow) are used as-is without a cast.
+    # Their float64 view can be read-only, so results are built, never set in place.
+    if is_numeric_dtype(price):
+        return price.astype("float64")
+    s = price if is_string_dtype(price) else price.astype("string")
+    num = pd.to_numeric(s, errors="coerce").astype("float64")
+    mask = num.isna() & s.notna()
+    if mask.any():
+        cleaned = (
+            s[mask]
+            .str.replace(PRICE_STRIP_PATTERN, "", regex=True)
+            .str.extract(PRICE_DIGITS_PATTERN, expand=False)
+        )
+        num = num.mask(mask, pd.to_numeric(cleaned, errors="coerce").astype("float64"))
+    return num
+
+
+def normalize_cartier_url(url: pd.Series, country_path="/fr-fr") -> pd.Series:
+    u = url.fillna("").str.strip()
+    is_abs = u.str.startswith("http://") | u.str.startswith("https://")
+    path = u.where(
+        u.str.startswith(country_path),
+        (country_path + u).where(u.str.startswith("/"), country_path + "/" + u),
+    )
+    return ("https://www.cartier.com" + path).where(~is_abs, u).where(u != "", "")
 
-def build_baseline_2026_fe(raw_csv: Path) -> pd.DataFrame:
-    df = pd.read_csv(raw_csv)
 
-    expected = {"reference_code", "local_reference", "title", "price", "currency", "url"}
-    missing = expected - set(df.columns)
-    if missing:
-        raise ValueError(f"RAW_2026 missing columns: {missing} | got={df.columns.tolist()}")
+def infer_market_from_url(url_full: pd.Series, country_path="/fr-fr") -> pd.Series:
+    """
+    Example: https://www.cartier.com/fr-fr/... -> fr-fr
+    normalize_cartier_url gives almost every row the same country prefix, so those
+    rows are resolved with a fixed-string startswith; the regex only runs on the rest.
+    """
+    site = "https://www.cartier.com/"
+    known = url_full.str.startswith(site + country_path.strip("/") + "/")
+    market = url_full.str.slice(len(site), len(site) + len(country_path.strip("/"))).where(known, "")
+    rest = ~known & (url_full != "")
+    if rest.any():
+        market = market.where(~rest, url_full[rest].str.extract(MARKET_PATTERN, expand=False).fillna(""))
+    return market
+
+
+# Ordered: first matching collection wins. Extend keywords as needed.
+COLLECTION_KEYWORDS = [
+    ("Tank", ["tank"]),
+    ("Santos", ["santos"]),
+    ("Panthère", ["panth"]),  # covers panthere / panthère
+    ("Ballon Bleu", ["ballon bleu", "ballon-bleu", "ballonbleu"]),
+    ("Trinity", ["trinity"]),
+]
+# keywords are lowercased here so they always match the once-lowercased text
+COLLECTION_PATTERNS = [(name, "|".join(re.escape(k.lower()) for k in kws)) for name, kws in COLLECTION_KEYWORDS]
+
+
+def canonicalize_collection_from_text(text: pd.Series) -> pd.Series:
+    """
+    Role A requirement: use string match (str.contains) in title/url to infer collection.
+    One vectorized str.contains per collection; np.select keeps first-match order.
+    """
+    t = text.fillna("").str.lower()
+    masks = [t.str.contains(pat, regex=True, na=False).to_numpy() for _, pat in COLLECTION_PATTERNS]
+    labels = [name for name, _ in COLLECTION_PATTERNS]
+    return pd.Series(np.select(masks, labels, default="Other"), index=text.index, dtype=object)
 
-    df = df.copy()
-    df["year"] = 2026
+RAW_2026_COLUMNS = ["reference_code", "local_reference", "title", "price", "currency", "url"]
 
-    df["currency"] = df["currency"].astype(str).str.strip().str.upper()
-    df["price_eur"] = df["price"].apply(parse_price_to_float)
 
-    df["title"] = df["title"].fillna("").astype(str).str.strip()
-    df["url"] = df["url"].fillna("").astype(str).str.strip()
-    df["url_full"] = df["url"].apply(lambda x: normalize_cartier_url(x, country_path="/fr-fr"))
-    df["market"] = df["url_full"].apply(infer_market_from_url)
+def build_baseline_2026_fe(raw_csv: Path) -> pd.DataFrame:
+    # every raw column (price included) is read as Arrow string, so the .str
+    # chains below run on Arrow kernels with no .astype(str) round-trip
+    # check against the full header: after usecols the frame only holds survivors
+    header = read_csv_header(raw_csv)
+    missing = set(RAW_2026_COLUMNS) - set(header)
+    if missing:
+        raise ValueError(f"RAW_2026 missing columns: {missing} | got={header}")
+
+    df = read_csv_arrow(raw_csv, usecols=RAW_2026_COLUMNS, string_cols=RAW_2026_COLUMNS)
 
     for c in ["reference_code", "local_reference"]:
-        if c in df.columns:
-            df[c] = df[c].fillna("").astype(str).str.strip().str.upper()
+        df[c] = normalize_code(df[c])
 
+    # dedup before deriving columns so the string work below only touches kept rows
     before = len(df)
-    df = df[df["reference_code"] != ""].copy()
-    df = df.drop_duplicates(subset=["reference_code"], keep="first")
+    df = df.loc[df["reference_code"] != ""].drop_duplicates(subset=["reference_code"], keep="first")
     print(f"[QA] 2026 dedup by reference_code: {before} -> {len(df)}")
 
+    df["year"] = 2026
+
+    df["currency"] = df["currency"].str.strip().str.upper()
+    df["price_eur"] = parse_price_to_float(df["price"])
+
+    df["title"] = df["title"].fillna("").str.strip()
+    df["url"] = df["url"].fillna("").str.strip()
+    df["url_full"] = normalize_cartier_url(df["url"], country_path="/fr-fr")
+    df["market"] = infer_market_from_url(df["url_full"], country_path="/fr-fr")
+
     out = df[
         [
             "year",
@@ -117,7 +173,10 @@ def build_baseline_2026_fe(raw_csv: Path) -> pd.DataFrame:
             "url_full",
             "market",
         ]
-    ].copy()
+    ]
+    # low-cardinality labels: category codes instead of one string object per row
+    for c in ["currency", "market"]:
+        out[c] = out[c].astype("category")
 
     print("[QA] 2026 rows:", len(out))
     print("[QA] 2026 missing price_eur ratio:", out["price_eur"].isna().mean())
@@ -135,16 +194,16 @@ def build_current_2026_labeled(df_2026_fe: pd.DataFrame) -> pd.DataFrame:
       - market/locale
       - url or title
     """
-    df = df_2026_fe.copy()
-    df["collection_canonical"] = (df["title"].fillna("") + " " + df["url_full"].fillna("")).apply(
-        canonicalize_collection_from_text
-    )
+    # label from a transient text Series and select only the output columns;
+    # the insert below never writes back into df_2026_fe
+    collection_canonical = canonicalize_collection_from_text(
+        df_2026_fe["title"].fillna("") + " " + df_2026_fe["url_full"].fillna("")
+    ).astype("category")
 
-    labeled = df[
+    labeled = df_2026_fe[
         [
             "year",
             "reference_code",
-            "collection_canonical",
             "price",
             "price_eur",
             "currency",
@@ -152,7 +211,8 @@ def build_current_2026_labeled(df_2026_fe: pd.DataFrame) -> pd.DataFrame:
             "title",
             "url_full",
         ]
-    ].copy()
+    ]
+    labeled.insert(2, "collection_canonical", collection_canonical)
 
     return labeled
 
@@ -170,10 +230,9 @@ def main():
     if args.raw_2026_file:
         raw_2026 = raw_dir / args.raw_2026_file
     else:
-        candidates = sorted(raw_dir.glob("current_2026_raw*.csv"))
-        if not candidates:
+        raw_2026 = max(raw_dir.glob("current_2026_raw*.csv"), default=None)
+        if raw_2026 is None:
             raise FileNotFoundError(f"No current_2026_raw*.csv found under {raw_dir.resolve()}")
-        raw_2026 = candidates[-1]
 
     df_2026_fe = build_baseline_2026_fe(raw_2026)
     df_2026_lab = build_current_2026_labeled(df_2026_fe)
@@ -181,11 +240,13 @@ def main():
     fe_path = processed_dir / f"baseline_2026_fe_{ts()}.csv"
     lab_path = processed_dir / f"current_2026_labeled_{ts()}.csv"
 
-    df_2026_fe.to_csv(fe_path, index=False, encoding="utf-8-sig")
-    df_2026_lab.to_csv(lab_path, index=False, encoding="utf-8-sig")
+    write_csv_arrow(df_2026_fe, fe_path)
+    write_csv_arrow(df_2026_lab, lab_path)
 
     print(f"[OK] Saved: {fe_path}")
     print(f"[OK] Saved: {lab_path}")
+    for df, path in [(df_2026_fe, fe_path), (df_2026_lab, lab_path)]:
+        print(f"[OK] Saved: {write_parquet_sidecar(df, path)}")
     print(df_2026_lab.head(5).to_string(index=False))
 
 